@@ -147,23 +147,18 @@ class SQLQueryInterface:
                 continue
             con.register(table_name, df)
 
-        # Spezielle Registrierung: rawdata_original (geflachte Originalspalten aus 'features')
+        # Spezielle Registrierung: rawdata_original (geflachte Originalspalten je Record)
         try:
             raw_tbl = self.db.data.get("tables", {}).get("rawdata", {})
             raw_records = raw_tbl.get("records", []) or []
             if raw_records:
                 raw_df = pd.DataFrame(raw_records)
-                # 'features' kann fehlen oder null sein
-                features_series = raw_df.get("features")
-                if features_series is not None:
-                    try:
-                        # json_normalize auf dict-ähnlichen Inhalten, robuste Füllung bei None
-                        feat_df = pd.json_normalize([
-                            (r if isinstance(r, dict) else {}) for r in features_series.tolist()
-                        ])
-                    except Exception:
-                        feat_df = pd.DataFrame()
-                else:
+                # 'features' fehlt bei aktuellen Records – dann aus Top-Level Feldern rekonstruieren
+                try:
+                    feat_df = pd.json_normalize([
+                        (self.db.record_features(r) if isinstance(r, dict) else {}) for r in raw_records
+                    ])
+                except Exception:
                     feat_df = pd.DataFrame()
 
                 # Zusatz: bringe evtl. Kernfelder (Kunde/I_TIMEBASE) auch dann rein,
@@ -318,7 +313,7 @@ class SQLQueryInterface:
                 "  SELECT DISTINCT cd.Kunde\n"
                 "  FROM customer_details cd\n"
                 "  JOIN target t ON cd.experiment_id = t.experiment_id\n"
-                "  WHERE cd.I_ALIVE = 'False'\n"
+                "  WHERE cd.I_ALIVE = FALSE\n"
                 "),\n"
             )
             base_filter_clause = "  WHERE cd.Kunde IN (SELECT Kunde FROM churned_base)\n"
@@ -30,6 +30,10 @@ class ProjectPaths:
     def dynamic_system_outputs_directory(cls) -> Path:
         return cls.project_root() / "dynamic_system_outputs"
 
+    @classmethod
+    def stage0_cache_directory(cls) -> Path:
+        return cls.dynamic_system_outputs_directory() / "stage0_cache"
+
     # OUTBOX (wichtig: JSON-DB importiert aus BL-Outbox)
     @classmethod
     def outbox_directory(cls) -> Path:
@@ -0,0 +1,24 @@
+"""
+Gemeinsame Fixtures für die Tests der JSON-Datenbank
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Projekt-Root importierbar machen (config.*, bl.*)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bl.json_database.churn_json_database import ChurnJSONDatabase  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "churn_database.json"
+
+
+@pytest.fixture
+def db(db_path):
+    """Neue, leere Datenbank in einem temporären Verzeichnis"""
+    return ChurnJSONDatabase(str(db_path))
@@ -0,0 +1,71 @@
+"""
+Speichern und Laden: NaN/Infinity und übrige Werte müssen über JSON- und
+JSONL-Ablage unverändert zurückkommen.
+"""
+
+import json
+
+import pytest
+
+from bl.json_database.churn_json_database import ChurnJSONDatabase
+
+
+def _records():
+    return [
+        {"Kunde": 1, "prob": float("nan"), "note": None, "tags": ["a", "null"]},
+        {"Kunde": 2, "prob": float("inf"), "delta": float("-inf"), "nested": {"x": 1.5}},
+        {"Kunde": 3, "prob": 0.25, "text": "Größe ä"},
+    ]
+
+
+def _canonical(records):
+    # json schreibt NaN/Infinity als Literale – so sind NaN-Werte vergleichbar
+    return json.dumps(records, sort_keys=True)
+
+
+@pytest.mark.parametrize("jsonl_storage", [False, True], ids=["json", "jsonl"])
+def test_nan_survives_save_and_load(db_path, jsonl_storage):
+    db = ChurnJSONDatabase(str(db_path), jsonl_storage=jsonl_storage)
+    db.data["tables"]["backtest_results"]["records"] = _records()
+    assert db.save()
+
+    reloaded = ChurnJSONDatabase(str(db_path), jsonl_storage=jsonl_storage)
+    assert _canonical(reloaded.data["tables"]["backtest_results"]["records"]) == _canonical(_records())
+
+
+def test_jsonl_append_and_rewrite_keep_nan(db_path):
+    db = ChurnJSONDatabase(str(db_path), jsonl_storage=True)
+    records = db.data["tables"]["backtest_results"]["records"]
+    records.extend(_records()[:1])
+    assert db.save()
+    # Nur angehängt → Sidecar wird fortgeschrieben
+    records.extend(_records()[1:])
+    assert db.save()
+    # In-place geändert → Sidecar wird neu geschrieben
+    records[2]["prob"] = float("nan")
+    db._mark_records_modified("backtest_results")
+    assert db.save()
+
+    expected = _records()
+    expected[2]["prob"] = float("nan")
+    reloaded = ChurnJSONDatabase(str(db_path), jsonl_storage=True)
+    assert _canonical(reloaded.data["tables"]["backtest_results"]["records"]) == _canonical(expected)
+
+
+def test_legacy_flag_strings_are_migrated_per_record(db_path):
+    db = ChurnJSONDatabase(str(db_path))
+    # Gemischter Bestand: erster Record bereits bool, spätere noch als String
+    db.data["tables"]["customer_details"]["records"] = [
+        {"Kunde": 1, "I_ALIVE": True, "Predicted_Optimal": False},
+        {"Kunde": 2, "I_ALIVE": "False", "Predicted_Optimal": "True"},
+        {"Kunde": 3, "Predicted_Elbow": "False"},
+    ]
+    assert db.save()
+
+    reloaded = ChurnJSONDatabase(str(db_path))
+    assert reloaded.data["tables"]["customer_details"]["records"] == [
+        {"Kunde": 1, "I_ALIVE": True, "Predicted_Optimal": False},
+        {"Kunde": 2, "I_ALIVE": False, "Predicted_Optimal": True},
+        {"Kunde": 3, "Predicted_Elbow": False},
+    ]
+    assert "customer_details" in reloaded._dirty_tables
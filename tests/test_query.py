@@ -0,0 +1,169 @@
+"""
+query(): Plan-Cache, kompilierte WHERE-Prädikate sowie Index- und Vektor-Vorfilter
+müssen dieselben Records liefern wie eine direkte Auswertung Bedingung für Bedingung.
+"""
+
+import json
+import random
+
+import pytest
+
+from bl.json_database.churn_json_database import ChurnJSONDatabase, _VECTOR_SCAN_MIN_ROWS
+
+
+def _number(value):
+    if isinstance(value, str):
+        value = value.replace(",", ".")
+    return float(value)
+
+
+def _reference_match(record, conditions):
+    """Direkte Auswertung wie der ursprüngliche Record-für-Record-Vergleich"""
+    for condition in conditions:
+        field, op, expected = condition["field"], condition["operator"], condition["value"]
+        if field not in record:
+            return False
+        actual = record[field]
+        if op == "=":
+            if actual != expected:
+                return False
+        elif op == "!=":
+            if actual == expected:
+                return False
+        else:
+            try:
+                a, e = _number(actual), _number(expected)
+            except (ValueError, TypeError):
+                return False
+            # Ausschluss-Vergleich wie im Original: NaN wird nie ausgeschlossen
+            rejected = {">": a <= e, "<": a >= e, ">=": a < e, "<=": a > e}[op]
+            if rejected:
+                return False
+    return True
+
+
+def _reference_query(db, table, jql):
+    where = jql.split(" WHERE ", 1)[1]
+    limit = None
+    if " LIMIT " in where:
+        where, limit = where.rsplit(" LIMIT ", 1)
+        limit = int(limit)
+    conditions = ChurnJSONDatabase._parse_where_conditions(where)
+    rows = [r for r in db.data["tables"][table]["records"] if _reference_match(r, conditions)]
+    return rows[:limit] if limit is not None else rows
+
+
+def _make_records(n, seed=0):
+    rnd = random.Random(seed)
+    scores = [0.1, 0.5, 0.75, float("nan"), "0,5", "0,25", "1,5", "abc", None, 2, "3"]
+    segments = ["A", "B", "A AND B", "LIMITED", "where", "C"]
+    records = []
+    for i in range(n):
+        record = {"Kunde": i % 97, "segment": rnd.choice(segments), "where_flag": rnd.randint(0, 1),
+                  "limited": rnd.randint(0, 5)}
+        if rnd.random() > 0.05:
+            record["score"] = rnd.choice(scores)
+        records.append(record)
+    return records
+
+
+QUERIES = [
+    "SELECT * FROM t WHERE score > 0,5",
+    "SELECT * FROM t WHERE score >= 0.25 AND segment = 'A'",
+    "SELECT * FROM t WHERE score <= 0,5 AND Kunde != 5",
+    "SELECT * FROM t WHERE score < 1",
+    "SELECT * FROM t WHERE segment = 'A AND B'",
+    "SELECT * FROM t WHERE segment = 'LIMITED'",
+    "SELECT * FROM t WHERE segment = 'where' AND where_flag = 1",
+    "SELECT * FROM t WHERE where_flag = 1 AND limited > 2",
+    "SELECT * FROM t WHERE Kunde = 17",
+    "SELECT * FROM t WHERE Kunde = 17 AND score > 0,3",
+    "SELECT * FROM t WHERE score > abc",
+    "SELECT * FROM t WHERE score > 0,5 LIMIT 10",
+]
+
+
+@pytest.fixture(params=[50, _VECTOR_SCAN_MIN_ROWS * 3], ids=["klein", "vektor"])
+def table_db(request, db):
+    db.data["tables"]["t"] = {"records": _make_records(request.param)}
+    return db
+
+
+@pytest.mark.parametrize("jql", QUERIES)
+def test_query_matches_reference(table_db, jql):
+    expected = _reference_query(table_db, "t", jql)
+    # Erster Aufruf, Treffer im Plan-Cache und nach geleertem Cache
+    assert table_db.query(jql) == expected
+    assert table_db.query(jql) == expected
+    ChurnJSONDatabase._compile_query.cache_clear()
+    assert table_db.query(jql) == expected
+
+
+def test_query_batch_matches_single_queries(table_db):
+    assert table_db.query_batch(QUERIES) == [table_db.query(q) for q in QUERIES]
+
+
+def test_query_sees_appended_records(table_db):
+    jql = "SELECT * FROM t WHERE Kunde = 17 AND score > 0,3"
+    table_db.query(jql)
+    records = table_db.data["tables"]["t"]["records"]
+    records.append({"Kunde": 17, "score": "0,9", "segment": "A"})
+    assert table_db.query(jql) == _reference_query(table_db, "t", jql)
+
+
+@pytest.mark.parametrize("n", [10, _VECTOR_SCAN_MIN_ROWS * 2])
+def test_nan_handled_alike_in_predicate_and_vector_path(db, n):
+    # Wie im ursprünglichen Vergleich schließt keine Bedingung NaN aus
+    db.data["tables"]["n"] = {"records": [{"score": float("nan"), "i": i} for i in range(n)]}
+    for op in (">", "<", ">=", "<="):
+        assert len(db.query(f"SELECT * FROM n WHERE score {op} 0,5")) == n
+
+
+def test_clause_keywords_match_whole_words_only(db):
+    db.data["tables"]["orders"] = {"records": [
+        {"selection": 1, "limited": 3, "from_date": "x"},
+        {"selection": 2, "limited": 1, "from_date": "y"},
+    ]}
+    assert db.query("SELECT selection FROM orders WHERE limited > 2") == [{"selection": 1}]
+    assert db.query("SELECT from_date FROM orders LIMIT 1") == [{"from_date": "x"}]
+
+
+def test_query_sees_in_place_edits_after_mark_records_modified(table_db):
+    # Gleichheit (Werte-Index) und numerischer Vergleich (Float-Spalte) auf derselben Spalte
+    eq_jql = "SELECT * FROM t WHERE Kunde = 17"
+    cmp_jql = "SELECT * FROM t WHERE Kunde > 95"
+    table_db.query(eq_jql)
+    table_db.query(cmp_jql)
+    records = table_db.data["tables"]["t"]["records"]
+    edited = next(r for r in records if r["Kunde"] == 17)
+    edited["Kunde"] = 1000
+    table_db._mark_records_modified("t")
+    for jql in (eq_jql, cmp_jql):
+        assert table_db.query(jql) == _reference_query(table_db, "t", jql)
+    assert any(r is edited for r in table_db.query(cmp_jql))
+
+
+def test_group_by_vector_path_matches_python_path(db):
+    from bl.json_database.churn_json_database import (
+        _GROUP_AGGREGATES, _VECTOR_GROUP_MIN_ROWS, _parse_group_aggregates,
+    )
+    rnd = random.Random(1)
+    records = [{"seg": f"S{i % 7}", "v": rnd.choice([0.1, 0.2, 1e16, -1e16, 3, 1.5])}
+               for i in range(_VECTOR_GROUP_MIN_ROWS * 2)]
+    # Auslöschung: naive Summe liefert 0.0, exakt ist 1.0
+    records += [{"seg": "X", "v": v} for v in (1e16, 1.0, -1e16)]
+    records += [{"seg": "B", "v": "abc"}, {"seg": "B", "v": 1}]
+    records += [{"seg": "I", "v": float("inf")}, {"seg": "I", "v": float("-inf")}, {"seg": "J", "v": float("inf")}]
+    select = "seg, SUM(v), AVG(v), MIN(v), MAX(v), COUNT(*)"
+    result = db._apply_group_by(records, select, ["seg"])
+
+    groups = {}
+    for r in records:
+        groups.setdefault(str(r["seg"]), []).append(r)
+    expected = [
+        {"seg": rs[0]["seg"], **{out: _GROUP_AGGREGATES[op](rs, name)
+                                 for out, op, name in _parse_group_aggregates(select, ("seg",))}}
+        for rs in groups.values()
+    ]
+    assert json.dumps(result) == json.dumps(expected)
+    assert next(r for r in result if r["seg"] == "X")["SUM(v)"] == 1.0
@@ -0,0 +1,137 @@
+"""
+Stage0-Import: Erkennung der Record-Liste beim Streamen und Konvertierungsregel
+(alle Records Dicts, mindestens einer mit 'Kunde') wie beim vollständigen Laden.
+"""
+
+import json
+
+import pytest
+
+from bl.json_database.churn_json_database import _extract_records, _stage0_records_prefix
+
+ijson = pytest.importorskip("ijson")
+
+
+def _write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("data, prefix", [
+    ([{"Kunde": 1}], "item"),
+    ({"meta": {"records": [1]}, "records": [{"Kunde": 1}]}, "records.item"),
+    ({"records": [], "complete_data": [{"Kunde": 1}]}, "complete_data.item"),
+    ({"records": None, "complete_data": [{"Kunde": 1}]}, "complete_data.item"),
+    ({"complete_data": [{"Kunde": 1}], "records": [{"Kunde": 2}]}, ""),
+    ({"complete_data": [{"Kunde": 1}]}, ""),
+    ({"records": {"Kunde": 1}, "complete_data": [{"Kunde": 2}]}, None),
+    ({"records": "x", "complete_data": [{"Kunde": 2}]}, None),
+    ({"meta": 1}, None),
+    (42, None),
+])
+def test_records_prefix_follows_extract_records(tmp_path, data, prefix):
+    path = _write(tmp_path, "stage0.json", data)
+    assert _stage0_records_prefix(path) == prefix
+    # Präfix und vollständiges Laden liefern dieselbe Record-Liste
+    if prefix:
+        with open(path, "rb") as f:
+            assert list(ijson.items(f, prefix)) == _extract_records(data)
+    elif prefix is None:
+        assert _extract_records(data) is None
+
+
+def test_records_prefix_rejects_truncated_file_without_records(tmp_path):
+    path = _write(tmp_path, "stage0.json", '{"meta": {"a": 1}, "other": [1, 2')
+    with pytest.raises(ijson.JSONError):
+        _stage0_records_prefix(path)
+
+
+@pytest.mark.parametrize("merge", [False, True], ids=["add", "merge"])
+def test_truncated_file_leaves_no_orphan_file_record(db, tmp_path, merge):
+    path = _write(tmp_path, "stage0.json", '{"records": [{"Kunde": 1}, {"Kunde": 2')
+    importer = db.merge_add_customers_from_stage0 if merge else db.add_customers_from_stage0
+    files_before = list(db.data["tables"].get("files", {}).get("records", []))
+    rawdata_before = list(db.data["tables"]["rawdata"]["records"])
+    assert importer(str(path)) is False
+    assert db.data["tables"].get("files", {}).get("records", []) == files_before
+    assert db.data["tables"]["rawdata"]["records"] == rawdata_before
+
+
+@pytest.mark.parametrize("merge", [False, True], ids=["add", "merge"])
+def test_complete_data_before_records_uses_records(db, tmp_path, merge):
+    data = {"complete_data": [{"Kunde": 1}], "records": [{"Kunde": 2}, {"Kunde": 3}]}
+    path = _write(tmp_path, "stage0.json", data)
+    importer = db.merge_add_customers_from_stage0 if merge else db.add_customers_from_stage0
+    assert importer(str(path)) is True
+    assert [str(r["Kunde"]) for r in db.data["tables"]["rawdata"]["records"]] == ["2", "3"]
+
+
+@pytest.mark.parametrize("merge", [False, True], ids=["add", "merge"])
+def test_kunde_in_later_record_is_converted(db, tmp_path, merge):
+    path = _write(tmp_path, "stage0.json", [{"customer_id": 7}, {"Kunde": 8}])
+    importer = db.merge_add_customers_from_stage0 if merge else db.add_customers_from_stage0
+    assert importer(str(path)) is True
+    assert [str(r["Kunde"]) for r in db.data["tables"]["rawdata"]["records"]] == ["7", "8"]
+
+
+@pytest.mark.parametrize("merge", [False, True], ids=["add", "merge"])
+@pytest.mark.parametrize("data", [
+    [{"Kunde": 1}, "kein Record", {"Kunde": 2}],
+    [{"customer_id": 1}, {"customer_id": 2}],
+], ids=["nicht-dict", "ohne-kunde"])
+def test_unconvertible_records_only_register_file(db, tmp_path, merge, data):
+    path = _write(tmp_path, "stage0.json", data)
+    importer = db.merge_add_customers_from_stage0 if merge else db.add_customers_from_stage0
+    files_before = len(db.data["tables"].get("files", {}).get("records", []))
+    assert importer(str(path)) is True
+    assert db.data["tables"]["rawdata"]["records"] == []
+    assert len(db.data["tables"]["files"]["records"]) == files_before + 1
+
+
+def test_append_with_dedup_skips_duplicates_within_and_across_batches(db, tmp_path, monkeypatch):
+    from config.paths_config import ProjectPaths
+    monkeypatch.setattr(ProjectPaths, "stage0_cache_directory", classmethod(lambda cls: tmp_path))
+    _write(tmp_path, "a.json", [
+        {"Kunde": 1, "I_TIMEBASE": 202401},
+        {"Kunde": 1, "I_TIMEBASE": 202401},  # Dublette innerhalb der Datei
+        {"Kunde": 1, "I_TIMEBASE": 202402},
+        {"Kunde": 2, "I_TIMEBASE": 202401},
+    ])
+    _write(tmp_path, "b.json", [
+        {"Kunde": 2, "I_TIMEBASE": 202401},  # Dublette aus a.json
+        {"Kunde": "3", "I_TIMEBASE": None},  # Dublette des Bestands (als String normalisiert)
+        {"Kunde": 4},
+    ])
+    db.data["tables"]["rawdata"]["records"] = [{"id": 1, "Kunde": 3}]
+    file_ids = [db.create_file_record(name, source_type="stage0_cache") for name in ("a.json", "b.json")]
+    db.data["tables"]["experiments"]["records"].append({"experiment_id": 1, "id_files": file_ids})
+
+    assert db.append_rawdata_from_experiment_files(dedup=True) == 4
+    records = db.data["tables"]["rawdata"]["records"]
+    assert [(r["Kunde"], r.get("I_TIMEBASE")) for r in records] == [
+        (3, None), (1, 202401), (1, 202402), (2, 202401), (4, None),
+    ]
+    assert [r["id"] for r in records] == [1, 2, 3, 4, 5]
+    # Zweiter Lauf: alles bereits vorhanden
+    assert db.append_rawdata_from_experiment_files(dedup=True) == 0
+    assert len(db.data["tables"]["rawdata"]["records"]) == 5
+
+
+@pytest.mark.parametrize("max_workers, without_orjson", [(None, False), (2, False), (2, True)],
+                         ids=["streaming", "geladen", "prozesse"])
+def test_unreadable_stage0_files_are_skipped_and_reported(db, tmp_path, monkeypatch, capsys,
+                                                          max_workers, without_orjson):
+    import bl.json_database.churn_json_database as module
+    if without_orjson:
+        monkeypatch.setattr(module, "orjson", None)
+    jobs = [
+        (_write(tmp_path, "a.json", [{"Kunde": 1}, {"Kunde": 2}]), 1),
+        (_write(tmp_path, "b.json", '{"records": [{"Kunde": 3'), 2),
+        (_write(tmp_path, "c.json", {"records": [{"Kunde": 4}]}), 3),
+        (tmp_path / "fehlt.json", 4),
+    ]
+    result = [(fid, raws and [r["id"] for r in raws]) for fid, raws in db._transform_stage0_jobs(jobs, 10, max_workers)]
+    assert result == [(1, [10, 11]), (2, None), (3, [12]), (4, None)]
+    out = capsys.readouterr().out
+    assert "b.json" in out and "fehlt.json" in out